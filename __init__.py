@@ -23,10 +23,16 @@ if "bpy" in locals():
     importlib.reload(lattice)  # noqa: F821
     importlib.reload(ui)  # noqa: F821
 
+from collections.abc import Callable  # noqa: E402
+from typing import TYPE_CHECKING, cast  # noqa: E402
+
 import bpy  # noqa: E402
 
 from . import subd, display, stamping, operators, lattice, ui  # noqa: E402
 
+if TYPE_CHECKING:
+    from bpy.stub_internal.rna_enums import EventTypeItems, SpaceTypeItems
+
 _all_classes = (
     *display.classes,
     *subd.classes,
@@ -36,68 +42,106 @@ _all_classes = (
     *ui.classes,
 )
 
+# The stubs type the factory's result as None
+_register_classes, _unregister_classes = cast(
+    tuple[Callable[[], None], Callable[[], None]],
+    bpy.utils.register_classes_factory(_all_classes),
+)
+
+# (keymap, space type, operator, key, oskey, shift)
+_KEYMAP_ITEMS: tuple[
+    tuple[
+        str, "SpaceTypeItems", type[bpy.types.Operator], "EventTypeItems", bool, bool
+    ],
+    ...,
+] = (
+    # CMD-1: Decrease subd level
+    (
+        "3D View",
+        "VIEW_3D",
+        subd.NINO_OT_decrease_subsurf_level,
+        "ONE",
+        True,
+        False,
+    ),
+    # CMD-2: Increase subd level
+    (
+        "3D View",
+        "VIEW_3D",
+        subd.NINO_OT_increase_subsurf_level,
+        "TWO",
+        True,
+        False,
+    ),
+    # CMD-3: Cycle subd preview
+    (
+        "3D View",
+        "VIEW_3D",
+        subd.NINO_OT_cycle_subsurf_preview,
+        "THREE",
+        True,
+        False,
+    ),
+    # CMD-SHIFT-D: Subdivide selection
+    (
+        "3D View",
+        "VIEW_3D",
+        subd.NINO_OT_subdivide_selection,
+        "D",
+        True,
+        True,
+    ),
+    # Backspace: Smart delete (in edit mode)
+    (
+        "Mesh",
+        "EMPTY",
+        operators.NINO_OT_smart_delete,
+        "BACK_SPACE",
+        False,
+        False,
+    ),
+)
+
 addon_keymaps = []
 
 
+def _find_keymap_item(km, idname, key, oskey, shift):
+    """Return the keymap item already bound to this shortcut, if any."""
+    for kmi in km.keymap_items:
+        if (
+            kmi.idname == idname
+            and kmi.type == key
+            and kmi.oskey == oskey
+            and kmi.shift == shift
+            and not kmi.ctrl
+            and not kmi.alt
+        ):
+            return kmi
+    return None
+
+
 def register():
-    for cls in _all_classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
 
     display.register()
 
-    # Add keymaps
+    # Add keymaps (no addon keyconfig when running in background mode)
     wm = bpy.context.window_manager
-    assert wm is not None
-    if wm.keyconfigs.addon:
-        kc = wm.keyconfigs.addon
-        km = kc.keymaps.new(name="3D View", space_type="VIEW_3D")
-
-        # CMD-1: Decrease subd level
-        kmi = km.keymap_items.new(
-            "nino.decrease_subsurf_level",
-            type="ONE",
-            value="PRESS",
-            oskey=True,
-        )
+    if not wm or not wm.keyconfigs.addon:
+        return
+
+    kc = wm.keyconfigs.addon
+    for km_name, space_type, op, key, oskey, shift in _KEYMAP_ITEMS:
+        km = kc.keymaps.new(name=km_name, space_type=space_type)
+        # Reuse entries left over from a previous register() (e.g. a reload)
+        # instead of stacking duplicates
+        kmi = _find_keymap_item(km, op.bl_idname, key, oskey, shift)
+        if kmi is None:
+            kmi = km.keymap_items.new(
+                op.bl_idname, type=key, value="PRESS", oskey=oskey, shift=shift
+            )
         addon_keymaps.append((km, kmi))
 
-        # CMD-2: Increase subd level
-        kmi = km.keymap_items.new(
-            "nino.increase_subsurf_level",
-            type="TWO",
-            value="PRESS",
-            oskey=True,
-        )
-        addon_keymaps.append((km, kmi))
-
-        # CMD-3: Cycle subd preview
-        kmi = km.keymap_items.new(
-            "nino.cycle_subsurf_preview",
-            type="THREE",
-            value="PRESS",
-            oskey=True,
-        )
-        addon_keymaps.append((km, kmi))
-
-        # CMD-SHIFT-D: Subdivide selection
-        kmi = km.keymap_items.new(
-            "nino.subdivide_selection",
-            type="D",
-            value="PRESS",
-            oskey=True,
-            shift=True,
-        )
-        addon_keymaps.append((km, kmi))
-
-        # Backspace: Smart delete (in edit mode)
-        km_mesh = kc.keymaps.new(name="Mesh", space_type="EMPTY")
-        kmi = km_mesh.keymap_items.new(
-            "nino.smart_delete",
-            type="BACK_SPACE",
-            value="PRESS",
-        )
-        addon_keymaps.append((km_mesh, kmi))
-
 
 def unregister():
     # Remove keymaps
@@ -107,8 +151,7 @@ def unregister():
 
     display.unregister()
 
-    for cls in reversed(_all_classes):
-        bpy.utils.unregister_class(cls)
+    _unregister_classes()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,21 @@ from bpy.types import PropertyGroup
 from bpy.props import BoolProperty
 from bpy.app.handlers import persistent
 
-_previous_selection = set()
+# Selected objects from the last handler run (RNA structs hash by pointer)
+_previous_selection: set[bpy.types.Object] = set()
+# (count, XOR of pointers) of _previous_selection, for a cheap "unchanged" check
+_previous_signature = (0, 0)
+
+# Seconds to wait after a depsgraph update before refreshing wireframes
+WIRE_REFRESH_DELAY = 0.05
+# (scene name, view layer name) of the latest update, resolved by the timer.
+# Timers run without a window, so bpy.context.view_layer there is just the
+# scene's default layer, not the one the user is working in.
+_pending_view_layer: tuple[str, str] | None = None
+
+
+def _on_wireframe_toggle(self, context):
+    sync_wire_handler()
 
 
 class NinoToolsSettings(PropertyGroup):
@@ -15,6 +29,7 @@ class NinoToolsSettings(PropertyGroup):
         name="Show Wireframe on Selected",
         description="Automatically show wireframe on selected objects",
         default=False,
+        update=_on_wireframe_toggle,
     )
 
     wireframe_hierarchy: BoolProperty(
@@ -30,69 +45,198 @@ class NinoToolsSettings(PropertyGroup):
     )
 
 
-def set_wire_recursive(obj, enabled):
-    """Recursively set wireframe display for an object and its children"""
-    if obj.type == "MESH":
-        obj.show_wire = enabled
-    for child in obj.children:
-        set_wire_recursive(child, enabled)
+def _build_children_map():
+    """Map each parent object to its direct children in one pass."""
+    children_map = {}
+    for obj in bpy.data.objects:
+        parent = obj.parent
+        if parent is not None:
+            children_map.setdefault(parent, []).append(obj)
+    return children_map
+
+
+def set_wire_recursive(obj, enabled, children_map=None):
+    """
+    Set wireframe display for an object and all of its descendants.
+
+    Object.children scans every object in the file on each access, so the
+    hierarchy is walked through a children map built once (and shareable
+    between calls) instead.
+    """
+    if children_map is None:
+        children_map = _build_children_map()
+
+    # Walk the hierarchy with an explicit stack rather than Python recursion
+    stack = [obj]
+    push = stack.extend
+    while stack:
+        node = stack.pop()
+        # Only write on change; every write tags the object for an update
+        if node.type == "MESH" and node.show_wire != enabled:
+            node.show_wire = enabled
+        push(children_map.get(node, ()))
 
 
 @persistent
 def update_wire_display(scene, depsgraph):
     """
-    Automatically toggle show_wire on selected objects and off on deselected objects.
-    This handler runs on every depsgraph update.
+    Schedule a wireframe refresh after updates that may change the selection.
+
+    This handler runs on every depsgraph update (dozens per second while
+    dragging), so it only schedules refresh_wire_display on a short timer;
+    a burst of updates collapses into a single refresh.
     """
-    global _previous_selection
+    global _pending_view_layer
 
-    settings = bpy.context.scene.nino_tools_settings
+    # Selection changes tag the scene, and adding/removing objects tags
+    # objects; updates that touch neither (materials, images, node trees...)
+    # can't have changed the selection.
+    if not (depsgraph.id_type_updated("SCENE") or depsgraph.id_type_updated("OBJECT")):
+        return
+
+    # Names, not RNA references, so they stay safe to hold until the timer fires
+    _pending_view_layer = (scene.name, depsgraph.view_layer.name)
+    if not bpy.app.timers.is_registered(refresh_wire_display):
+        bpy.app.timers.register(refresh_wire_display, first_interval=WIRE_REFRESH_DELAY)
+
+
+def refresh_wire_display():
+    """
+    Toggle show_wire on selected objects and off on deselected objects.
+
+    Runs as a one-shot timer, so the selection is read when it fires and the
+    latest state always wins.
+    """
+    global _previous_selection, _previous_signature
+
+    if _pending_view_layer is None:
+        return
+    scene_name, view_layer_name = _pending_view_layer
+    scene = bpy.data.scenes.get(scene_name)
+    view_layer = scene.view_layers.get(view_layer_name) if scene else None
+    if view_layer is None:
+        return
+    selected = view_layer.objects.selected
+
+    # Most updates (edits, transforms, frame changes) leave the selection
+    # alone, so bail out before touching the scene settings at all
+    pointer_xor = 0
+    for obj in selected:
+        pointer_xor ^= obj.as_pointer()
+    signature = (len(selected), pointer_xor)
+    if signature == _previous_signature:
+        return
 
+    settings = scene.nino_tools_settings
     if not settings.wireframe_on_selected:
         return
+    hierarchy = settings.wireframe_hierarchy
 
-    current_selection = set(obj.name for obj in bpy.context.selected_objects)
+    current_selection = set(selected)
 
     newly_selected = current_selection - _previous_selection
     newly_deselected = _previous_selection - current_selection
 
-    for obj_name in newly_selected:
-        obj = bpy.data.objects.get(obj_name)
-        if obj:
-            if settings.wireframe_hierarchy:
-                set_wire_recursive(obj, True)
-            elif obj.type == "MESH":
-                obj.show_wire = True
-
-    for obj_name in newly_deselected:
-        obj = bpy.data.objects.get(obj_name)
-        if obj:
-            if settings.wireframe_hierarchy:
-                set_wire_recursive(obj, False)
-            elif obj.type == "MESH":
+    children_map = _build_children_map() if hierarchy else None
+
+    for obj in newly_selected:
+        if hierarchy:
+            set_wire_recursive(obj, True, children_map)
+        elif obj.type == "MESH" and not obj.show_wire:
+            obj.show_wire = True
+
+    for obj in newly_deselected:
+        try:
+            if hierarchy:
+                set_wire_recursive(obj, False, children_map)
+            elif obj.type == "MESH" and obj.show_wire:
                 obj.show_wire = False
+        except ReferenceError:
+            # The object was deleted since the last update
+            continue
 
+    # The show_wire writes above fire one more depsgraph update after this
+    # returns; by then the signature matches, so that refresh exits early
     _previous_selection = current_selection
+    _previous_signature = signature
+
+
+@persistent
+def reset_selection_cache(*args):
+    """
+    Forget the tracked selection after loading a file or stepping undo/redo.
+
+    Both rebuild Blender's data, so object references held from before may
+    no longer be valid.
+    """
+    global _previous_signature
+    _previous_selection.clear()
+    _previous_signature = (0, 0)
+
+
+@persistent
+def sync_wire_handler(*args):
+    """
+    Install update_wire_display only while some scene has the feature enabled.
+
+    Keeps the depsgraph handler (and its per-update cost) out of the way when
+    nobody uses it. Runs on file load, undo/redo, and whenever the setting is
+    toggled.
+    """
+    handlers = bpy.app.handlers.depsgraph_update_post
+    wanted = any(
+        scene.nino_tools_settings.wireframe_on_selected for scene in bpy.data.scenes
+    )
+
+    if wanted and update_wire_display not in handlers:
+        reset_selection_cache()
+        handlers.append(update_wire_display)
+    elif not wanted and update_wire_display in handlers:
+        handlers.remove(update_wire_display)
+
+
+_RESET_HANDLERS = (
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
 
 
 def register():
-    """Register scene property and depsgraph handler."""
-    global _previous_selection
+    """Register scene property and handlers."""
+    global _previous_selection, _previous_signature
     _previous_selection = set()
+    _previous_signature = (0, 0)
 
     bpy.types.Scene.nino_tools_settings = bpy.props.PointerProperty(
         type=NinoToolsSettings
     )
 
-    if update_wire_display not in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.append(update_wire_display)
+    # Undo/redo restore wireframe_on_selected without running its update
+    # callback, so the depsgraph handler is re-synced there as well
+    for handlers in _RESET_HANDLERS:
+        for handler in (reset_selection_cache, sync_wire_handler):
+            if handler not in handlers:
+                handlers.append(handler)
+
+    # bpy.data is restricted while Blender is starting up; load_post covers that
+    if isinstance(bpy.data, bpy.types.BlendData):
+        sync_wire_handler()
 
 
 def unregister():
-    """Unregister scene property and depsgraph handler."""
+    """Unregister scene property and handlers."""
     if update_wire_display in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(update_wire_display)
 
+    if bpy.app.timers.is_registered(refresh_wire_display):
+        bpy.app.timers.unregister(refresh_wire_display)
+
+    for handlers in _RESET_HANDLERS:
+        for handler in (reset_selection_cache, sync_wire_handler):
+            if handler in handlers:
+                handlers.remove(handler)
+
     del bpy.types.Scene.nino_tools_settings
 
 
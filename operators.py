@@ -1,5 +1,6 @@
 """Standalone operators: shrinkwrap refresh, image reload, smart delete."""
 
+import os
 from typing import Literal
 
 import bpy
@@ -58,18 +59,45 @@ class NINO_OT_reload_all_images(bpy.types.Operator):
 
     bl_idname = "nino.reload_all_images"
     bl_label = "Reload All Images"
-    bl_options = {"REGISTER", "UNDO"}
+    # Reloaded pixels aren't part of undo anyway, so a snapshot only costs memory
+    bl_options = {"REGISTER"}
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
         reloaded_count = 0
+        missing_count = 0
+        failures: list[str] = []
 
         for img in bpy.data.images:
-            if img.filepath:
-                try:
-                    img.reload()
-                    reloaded_count += 1
-                except Exception as e:
-                    self.report({"WARNING"}, f"Failed to reload {img.name}: {str(e)}")
+            if not img.filepath:
+                continue
+            # Skip files that are gone from disk instead of paying for the failed
+            # read; packed images reload from the .blend and UDIM paths hold a
+            # <UDIM> token, so those can't be checked this way
+            if (
+                not img.packed_file
+                and img.source != "TILED"
+                and not os.path.exists(
+                    bpy.path.abspath(img.filepath, library=img.library)
+                )
+            ):
+                missing_count += 1
+                continue
+            try:
+                img.reload()
+                reloaded_count += 1
+            except Exception:
+                failures.append(img.name)
+
+        # One summary line instead of an info-log entry per broken image
+        problems = []
+        if missing_count:
+            problems.append(f"{missing_count} image(s) missing on disk")
+        if failures:
+            problems.append(
+                f"{len(failures)} image(s) failed to reload: {', '.join(failures)}"
+            )
+        if problems:
+            self.report({"WARNING"}, "; ".join(problems))
 
         if reloaded_count > 0:
             self.report({"INFO"}, f"Reloaded {reloaded_count} image(s)")
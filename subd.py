@@ -1,11 +1,18 @@
 """Subdivision surface operators and utilities."""
 
+import itertools
 from typing import cast, Literal
-import uuid
 
+import bmesh
 import bpy
 from bpy.props import IntProperty
-from bpy.types import Context, SubsurfModifier, Object
+from bpy.types import (
+    Context,
+    GeometryNodeTree,
+    NodesModifier,
+    Object,
+    SubsurfModifier,
+)
 
 OperatorReturnItems = Literal[
     "RUNNING_MODAL",
@@ -15,11 +22,38 @@ OperatorReturnItems = Literal[
     "INTERFACE",
 ]
 
+# (show_on_cage, show_in_editmode) -> next state: both on, unless already both on
+_PREVIEW_CYCLE = {
+    (False, False): (True, True),
+    (False, True): (True, True),
+    (True, False): (True, True),
+    (True, True): (False, False),
+}
+
+SUBDIVIDE_TREE_NAME = "NinoSubdivide"
+# Stamped on the shared node groups with the boundary mode they were built for
+SUBDIVIDE_TREE_KEY = "nino_subdivide_tree"
+SELECTION_SOCKET = "Selection"
+
+# Suffix for temporary vertex group / modifier names. Blender makes both names
+# unique on creation, so a per-session counter is enough
+_temp_name_ids = itertools.count()
+
+
+def _selected_meshes(context: Context) -> list[Object]:
+    """Snapshot the selected mesh objects once, so callers don't re-query RNA."""
+    return [obj for obj in context.selected_objects if obj.type == "MESH"]
+
 
 def get_existing_subsurf(obj) -> SubsurfModifier | None:
     """Get the last subdivision surface modifier, or None if none exists."""
-    subsurf_mods = [mod for mod in obj.modifiers if mod.type == "SUBSURF"]
-    return cast(SubsurfModifier, subsurf_mods[-1]) if subsurf_mods else None
+    # Scan from the end so we can stop at the first match
+    mods = obj.modifiers
+    for i in range(len(mods) - 1, -1, -1):
+        mod = mods[i]
+        if mod.type == "SUBSURF":
+            return cast(SubsurfModifier, mod)
+    return None
 
 
 def get_or_create_subsurf(
@@ -36,21 +70,51 @@ def get_or_create_subsurf(
     Returns:
         The subdivision surface modifier
     """
-    subsurf_mods = [mod for mod in obj.modifiers if mod.type == "SUBSURF"]
+    existing = get_existing_subsurf(obj)
+    if existing is not None:
+        return existing
+
+    mod = cast(SubsurfModifier, obj.modifiers.new(name="Subdivision", type="SUBSURF"))
+    mod.levels = default_viewport_level
+    mod.render_levels = default_render_level
+    mod.show_on_cage = False
+    mod.show_in_editmode = False
+    mod.show_viewport = True
+    mod.show_render = True
+    return mod
+
+
+def _collect_subsurfs(
+    context: Context, default_viewport_level=2, default_render_level=2
+) -> list[SubsurfModifier]:
+    """
+    Resolve the subsurf modifier of every selected mesh up front.
 
-    if subsurf_mods:
-        return cast(SubsurfModifier, subsurf_mods[-1])
-    else:
-        mod = cast(
-            SubsurfModifier, obj.modifiers.new(name="Subdivision", type="SUBSURF")
-        )
-        mod.levels = default_viewport_level
-        mod.render_levels = default_render_level
-        mod.show_on_cage = False
-        mod.show_in_editmode = False
-        mod.show_viewport = True
-        mod.show_render = True
-        return mod
+    Honours the ``subd_auto_create`` setting, so callers can apply their
+    change to the returned modifiers in one tight loop.
+    """
+    mesh_objs = _selected_meshes(context)
+    if not mesh_objs:
+        return []
+
+    auto_create = context.scene.nino_tools_settings.subd_auto_create
+    mods: list[SubsurfModifier] = []
+
+    for obj in mesh_objs:
+        if auto_create:
+            mods.append(
+                get_or_create_subsurf(
+                    obj,
+                    default_viewport_level=default_viewport_level,
+                    default_render_level=default_render_level,
+                )
+            )
+        else:
+            mod = get_existing_subsurf(obj)
+            if mod is not None:
+                mods.append(mod)
+
+    return mods
 
 
 class NINO_OT_decrease_subsurf_level(bpy.types.Operator):
@@ -58,32 +122,22 @@ class NINO_OT_decrease_subsurf_level(bpy.types.Operator):
 
     bl_idname = "nino.decrease_subsurf_level"
     bl_label = "Decrease Subd Level"
-    bl_options = {"REGISTER", "UNDO"}
+    # Usually tapped several times in a row from the keymap; grouping merges
+    # the repeats into one undo step instead of one snapshot per press
+    bl_options = {"REGISTER", "UNDO_GROUPED"}
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
-        auto_create = context.scene.nino_tools_settings.subd_auto_create
-        processed_count = 0
-
-        for obj in context.selected_objects:
-            if obj.type == "MESH":
-                if auto_create:
-                    mod = get_or_create_subsurf(
-                        obj, default_viewport_level=2, default_render_level=2
-                    )
-                else:
-                    mod = get_existing_subsurf(obj)
-                    if mod is None:
-                        continue
-                mod.levels -= 1
-                processed_count += 1
-
-        if processed_count > 0:
-            self.report(
-                {"INFO"}, f"Decreased subd level for {processed_count} object(s)"
-            )
-        else:
+        mods = _collect_subsurfs(
+            context, default_viewport_level=2, default_render_level=2
+        )
+        if not mods:
             self.report({"WARNING"}, "No mesh objects selected")
+            return {"CANCELLED"}
+
+        for mod in mods:
+            mod.levels -= 1
 
+        self.report({"INFO"}, f"Decreased subd level for {len(mods)} object(s)")
         return {"FINISHED"}
 
 
@@ -92,32 +146,20 @@ class NINO_OT_increase_subsurf_level(bpy.types.Operator):
 
     bl_idname = "nino.increase_subsurf_level"
     bl_label = "Increase Subd Level"
-    bl_options = {"REGISTER", "UNDO"}
+    bl_options = {"REGISTER", "UNDO_GROUPED"}
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
-        auto_create = context.scene.nino_tools_settings.subd_auto_create
-        processed_count = 0
-
-        for obj in context.selected_objects:
-            if obj.type == "MESH":
-                if auto_create:
-                    mod = get_or_create_subsurf(
-                        obj, default_viewport_level=1, default_render_level=2
-                    )
-                else:
-                    mod = get_existing_subsurf(obj)
-                    if mod is None:
-                        continue
-                mod.levels += 1
-                processed_count += 1
-
-        if processed_count > 0:
-            self.report(
-                {"INFO"}, f"Increased subd level for {processed_count} object(s)"
-            )
-        else:
+        mods = _collect_subsurfs(
+            context, default_viewport_level=1, default_render_level=2
+        )
+        if not mods:
             self.report({"WARNING"}, "No mesh objects selected")
+            return {"CANCELLED"}
+
+        for mod in mods:
+            mod.levels += 1
 
+        self.report({"INFO"}, f"Increased subd level for {len(mods)} object(s)")
         return {"FINISHED"}
 
 
@@ -126,37 +168,25 @@ class NINO_OT_cycle_subsurf_preview(bpy.types.Operator):
 
     bl_idname = "nino.cycle_subsurf_preview"
     bl_label = "Cycle Subd Preview"
-    bl_options = {"REGISTER", "UNDO"}
+    bl_options = {"REGISTER", "UNDO_GROUPED"}
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
-        auto_create = context.scene.nino_tools_settings.subd_auto_create
-        processed_count = 0
-
-        for obj in context.selected_objects:
-            if obj.type == "MESH":
-                if auto_create:
-                    mod = get_or_create_subsurf(
-                        obj, default_viewport_level=2, default_render_level=2
-                    )
-                else:
-                    mod = get_existing_subsurf(obj)
-                    if mod is None:
-                        continue
-
-                # Toggle between both off and both on
-                both_on = mod.show_on_cage and mod.show_in_editmode
-                mod.show_on_cage = not both_on
-                mod.show_in_editmode = not both_on
-
-                processed_count += 1
-
-        if processed_count > 0:
-            self.report(
-                {"INFO"}, f"Cycled subd preview for {processed_count} object(s)"
-            )
-        else:
+        mods = _collect_subsurfs(
+            context, default_viewport_level=2, default_render_level=2
+        )
+        if not mods:
             self.report({"WARNING"}, "No mesh objects selected")
+            return {"CANCELLED"}
 
+        for mod in mods:
+            on_cage, in_editmode = mod.show_on_cage, mod.show_in_editmode
+            new_on_cage, new_in_editmode = _PREVIEW_CYCLE[on_cage, in_editmode]
+            if new_on_cage != on_cage:
+                mod.show_on_cage = new_on_cage
+            if new_in_editmode != in_editmode:
+                mod.show_in_editmode = new_in_editmode
+
+        self.report({"INFO"}, f"Cycled subd preview for {len(mods)} object(s)")
         return {"FINISHED"}
 
 
@@ -170,32 +200,23 @@ class NINO_OT_set_subsurf_level(bpy.types.Operator):
     level: IntProperty(name="Level", default=2, min=0, max=11)
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
-        auto_create = context.scene.nino_tools_settings.subd_auto_create
-        processed_count = 0
-
-        for obj in context.selected_objects:
-            if obj.type == "MESH":
-                if auto_create:
-                    mod = get_or_create_subsurf(
-                        obj,
-                        default_viewport_level=self.level,
-                        default_render_level=max(self.level, 2),
-                    )
-                else:
-                    mod = get_existing_subsurf(obj)
-                    if mod is None:
-                        continue
-                mod.levels = self.level
-                processed_count += 1
-
-        if processed_count > 0:
-            self.report(
-                {"INFO"},
-                f"Set subd level to {self.level} for {processed_count} object(s)",
-            )
-        else:
+        level = self.level
+        mods = _collect_subsurfs(
+            context,
+            default_viewport_level=level,
+            default_render_level=max(level, 2),
+        )
+        if not mods:
             self.report({"WARNING"}, "No mesh objects selected")
+            return {"CANCELLED"}
+
+        for mod in mods:
+            mod.levels = level
 
+        self.report(
+            {"INFO"},
+            f"Set subd level to {self.level} for {len(mods)} object(s)",
+        )
         return {"FINISHED"}
 
 
@@ -207,29 +228,28 @@ class NINO_OT_toggle_subd(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
-        objects_with_subsurf: list[tuple[Object, SubsurfModifier]] = []
-
-        for obj in context.selected_objects:
-            if obj.type == "MESH":
-                subsurf_mods = [mod for mod in obj.modifiers if mod.type == "SUBSURF"]
-                for mod in subsurf_mods:
-                    objects_with_subsurf.append((obj, cast(SubsurfModifier, mod)))
-
-        if not objects_with_subsurf:
+        should_enable: bool | None = None
+        toggled_count = 0
+
+        # Single pass: the first subsurf found decides the new state for all
+        for obj in _selected_meshes(context):
+            for mod in obj.modifiers:
+                if mod.type != "SUBSURF":
+                    continue
+                if should_enable is None:
+                    should_enable = not mod.show_viewport
+                if mod.show_viewport != should_enable:
+                    mod.show_viewport = should_enable
+                if mod.show_render != should_enable:
+                    mod.show_render = should_enable
+                toggled_count += 1
+
+        if should_enable is None:
             self.report({"WARNING"}, "No selected objects with subsurf modifiers")
             return {"CANCELLED"}
 
-        first_mod = objects_with_subsurf[0][1]
-        should_enable = not first_mod.show_viewport
-
-        for obj, mod in objects_with_subsurf:
-            mod.show_viewport = should_enable
-            mod.show_render = should_enable
-
         action = "Enabled" if should_enable else "Disabled"
-        self.report(
-            {"INFO"}, f"{action} subd for {len(objects_with_subsurf)} modifier(s)"
-        )
+        self.report({"INFO"}, f"{action} subd for {toggled_count} modifier(s)")
 
         return {"FINISHED"}
 
@@ -242,67 +262,43 @@ class NINO_OT_toggle_optimal_display(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, context: Context) -> set[OperatorReturnItems]:
-        subsurf_mods: list[SubsurfModifier] = []
-
-        for obj in context.selected_objects:
-            if obj.type == "MESH":
-                for mod in obj.modifiers:
-                    if mod.type == "SUBSURF":
-                        subsurf_mods.append(cast(SubsurfModifier, mod))
-
-        if not subsurf_mods:
+        should_enable: bool | None = None
+        toggled_count = 0
+
+        # Single pass: the first subsurf found decides the new state for all
+        for obj in _selected_meshes(context):
+            for mod in obj.modifiers:
+                if not isinstance(mod, SubsurfModifier):
+                    continue
+                if should_enable is None:
+                    should_enable = not mod.show_only_control_edges
+                if mod.show_only_control_edges != should_enable:
+                    mod.show_only_control_edges = should_enable
+                toggled_count += 1
+
+        if should_enable is None:
             self.report({"WARNING"}, "No selected objects with subsurf modifiers")
             return {"CANCELLED"}
 
-        first_mod = subsurf_mods[0]
-        should_enable = not first_mod.show_only_control_edges
-
-        for mod in subsurf_mods:
-            mod.show_only_control_edges = should_enable
-
         action = "Enabled" if should_enable else "Disabled"
         self.report(
-            {"INFO"}, f"{action} optimal display for {len(subsurf_mods)} modifier(s)"
+            {"INFO"}, f"{action} optimal display for {toggled_count} modifier(s)"
         )
 
         return {"FINISHED"}
 
 
-def _subdivide_selection_impl(
-    context: Context, boundary_smooth: str = "All"
-) -> tuple[set[OperatorReturnItems], str]:
+def _build_subdivide_tree(name: str, boundary_smooth: str) -> GeometryNodeTree:
     """
-    Subdivide selected geometry using geometry nodes.
+    Create the node group that subdivides the vertex group passed to it.
 
-    Args:
-        context: Blender context
-        boundary_smooth: Boundary smooth mode ('All' or 'Keep Corners')
-
-    Returns:
-        Tuple of (operator return set, message)
+    The selection is a float input fed straight from an attribute on the
+    modifier, so no Named Attribute node has to be evaluated for it.
     """
-    if context.mode != "EDIT_MESH":
-        return {"CANCELLED"}, "Must be in edit mode"
-
-    obj = context.active_object
-    if obj is None or obj.type != "MESH":
-        return {"CANCELLED"}, "No active mesh object"
-
-    random_id = str(uuid.uuid4())[:8]
-    vertex_group_name = f"vertex-group-{random_id}"
-    modifier_name = f"geonodes-{random_id}"
-
-    obj.vertex_groups.new(name=vertex_group_name)
-    bpy.ops.object.vertex_group_assign()
-
-    bpy.ops.object.mode_set(mode="OBJECT")
-
-    modifier = obj.modifiers.new(name=modifier_name, type="NODES")
-
-    node_tree = bpy.data.node_groups.new(
-        name=f"Subdivide-{random_id}", type="GeometryNodeTree"
+    node_tree = cast(
+        GeometryNodeTree,
+        bpy.data.node_groups.new(name=name, type="GeometryNodeTree"),
     )
-    modifier.node_group = node_tree
 
     nodes = node_tree.nodes
     links = node_tree.links
@@ -318,6 +314,11 @@ def _subdivide_selection_impl(
     node_tree.interface.new_socket(
         name="Geometry", in_out="INPUT", socket_type="NodeSocketGeometry"
     )
+    selection_socket = node_tree.interface.new_socket(
+        name=SELECTION_SOCKET, in_out="INPUT", socket_type="NodeSocketFloat"
+    )
+    selection_socket.attribute_domain = "POINT"
+    selection_socket.default_attribute_name = ""
     node_tree.interface.new_socket(
         name="Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry"
     )
@@ -326,11 +327,6 @@ def _subdivide_selection_impl(
     separate_geo.location = (-300, 0)
     separate_geo.domain = "POINT"
 
-    named_attr = nodes.new("GeometryNodeInputNamedAttribute")
-    named_attr.location = (-500, -150)
-    named_attr.data_type = "FLOAT"
-    named_attr.inputs[0].default_value = vertex_group_name
-
     subsurf = nodes.new("GeometryNodeSubdivisionSurface")
     subsurf.location = (0, 100)
     subsurf.inputs["Level"].default_value = 1
@@ -350,7 +346,7 @@ def _subdivide_selection_impl(
     join_geo.location = (300, 0)
 
     links.new(group_input.outputs["Geometry"], separate_geo.inputs["Geometry"])
-    links.new(named_attr.outputs["Attribute"], separate_geo.inputs["Selection"])
+    links.new(group_input.outputs[SELECTION_SOCKET], separate_geo.inputs["Selection"])
     links.new(separate_geo.outputs["Selection"], subsurf.inputs["Mesh"])
     links.new(edge_crease_attr.outputs["Attribute"], subsurf.inputs["Edge Crease"])
     links.new(vert_crease_attr.outputs["Attribute"], subsurf.inputs["Vertex Crease"])
@@ -358,14 +354,104 @@ def _subdivide_selection_impl(
     links.new(separate_geo.outputs["Inverted"], join_geo.inputs["Geometry"])
     links.new(join_geo.outputs["Geometry"], group_output.inputs["Geometry"])
 
-    bpy.ops.object.modifier_apply(modifier=modifier_name)
+    node_tree[SUBDIVIDE_TREE_KEY] = boundary_smooth
+    return node_tree
+
+
+def _get_subdivide_tree(boundary_smooth: str) -> GeometryNodeTree:
+    """
+    Get the shared subdivide node group for a boundary mode, building it once.
+
+    The tree only differs per call in the vertex group it reads, which is
+    assigned as an attribute input on the modifier, so one tree per mode is
+    reused. It is looked up by name rather than held on to, since undo and
+    file loads invalidate ID references.
 
-    bpy.ops.object.mode_set(mode="EDIT")
+    Only trees stamped by _build_subdivide_tree are reused, so an unrelated
+    node group that happens to have the same name is never picked up.
+    """
+    name = f"{SUBDIVIDE_TREE_NAME} ({boundary_smooth})"
+    node_tree = bpy.data.node_groups.get(name)
+    if node_tree is not None and node_tree.get(SUBDIVIDE_TREE_KEY) == boundary_smooth:
+        return cast(GeometryNodeTree, node_tree)
 
-    active_object = bpy.context.active_object
-    group = active_object.vertex_groups.get(vertex_group_name)
-    if group:
-        active_object.vertex_groups.remove(group)
+    # Name taken by something else: ours may live on under a ".001" name
+    if node_tree is not None:
+        for candidate in bpy.data.node_groups:
+            if candidate.get(SUBDIVIDE_TREE_KEY) == boundary_smooth:
+                return cast(GeometryNodeTree, candidate)
+
+    return _build_subdivide_tree(name, boundary_smooth)
+
+
+def _subdivide_selection_impl(
+    context: Context, boundary_smooth: str = "All"
+) -> tuple[set[OperatorReturnItems], str]:
+    """
+    Subdivide selected geometry using geometry nodes.
+
+    Args:
+        context: Blender context
+        boundary_smooth: Boundary smooth mode ('All' or 'Keep Corners')
+
+    Returns:
+        Tuple of (operator return set, message)
+    """
+    if context.mode != "EDIT_MESH":
+        return {"CANCELLED"}, "Must be in edit mode"
+
+    obj = context.active_object
+    if obj is None or obj.type != "MESH":
+        return {"CANCELLED"}, "No active mesh object"
+
+    if obj.data.shape_keys:
+        return {"CANCELLED"}, "Cannot subdivide a mesh with shape keys"
+
+    # Evaluating the subdivision can take a while on dense meshes, so show
+    # progress on the cursor while the UI is blocked
+    wm = context.window_manager
+    wm.progress_begin(0, 4)
+    try:
+        random_id = f"{next(_temp_name_ids):08x}"
+        vertex_group_name = obj.vertex_groups.new(name=f"vertex-group-{random_id}").name
+        modifier_name = f"geonodes-{random_id}"
+
+        # Write the weights into the edit mesh's deform layer; switching to
+        # object mode below flushes them to the mesh along with any unsaved edits
+        group_index = obj.vertex_groups[vertex_group_name].index
+        bm = bmesh.from_edit_mesh(obj.data)  # type: ignore[arg-type]
+        deform = bm.verts.layers.deform.verify()
+        for v in bm.verts:
+            if v.select:
+                v[deform][group_index] = 1.0
+        wm.progress_update(1)
+
+        # modifier_apply needs object mode, so do it inside one mode_set pair
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+        modifier = cast(
+            NodesModifier, obj.modifiers.new(name=modifier_name, type="NODES")
+        )
+        # Only ever applied from object mode; never evaluate it on the edit cage
+        modifier.show_in_editmode = False
+        node_tree = _get_subdivide_tree(boundary_smooth)
+        modifier.node_group = node_tree
+        socket_id = node_tree.interface.items_tree[SELECTION_SOCKET].identifier
+        modifier[f"{socket_id}_use_attribute"] = True
+        modifier[f"{socket_id}_attribute_name"] = vertex_group_name
+        wm.progress_update(2)
+
+        bpy.ops.object.modifier_apply(modifier=modifier.name)
+        wm.progress_update(3)
+
+        bpy.ops.object.mode_set(mode="EDIT")
+
+        group = obj.vertex_groups.get(vertex_group_name)
+        if group:
+            obj.vertex_groups.remove(group)
+        wm.progress_update(4)
+    finally:
+        wm.progress_end()
 
     return {"FINISHED"}, "Subdivided selection"
 